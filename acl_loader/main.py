@@ -37,6 +37,15 @@ def deep_update(dst, src):
     return dst
 
 
+def rule_db_values(rule):
+    """
+    Convert the field values of a rule to strings, as Config DB stores them, so
+    that a rule converted from a file compares equal to the same rule read back
+    """
+    return dict((key, [str(v) for v in value] if isinstance(value, list) else str(value))
+                for key, value in rule.iteritems())
+
+
 class AclLoaderException(Exception):
     pass
 
@@ -405,62 +414,70 @@ class AclLoader(object):
 
         self.configdb.mod_config({self.ACL_RULE: self.rules_info})
 
-    def incremental_update(self):
+    def diff_rules(self):
         """
-        Perform incremental ACL rules configuration update. Get existing rules from
-        Config DB. Compare with rules specified in file and perform corresponding
-        modifications.
-        :return:
+        Compare the rules specified in file with the existing rules in Config DB,
+        table by table.
+        :return: Dictionary of table name to a (added, removed, changed) tuple of
+            rule key lists
         """
+        new_table_rules = {}
+        for key in self.rules_info.iterkeys():
+            new_table_rules.setdefault(key[0], set()).add(key)
 
-        # TODO: Until we test ASIC behavior, we cannot assume that we can insert
-        # dataplane ACLs and shift existing ACLs. Therefore, we perform a full
-        # update on dataplane ACLs, and only perform an incremental update on
-        # control plane ACLs.
+        current_table_rules = {}
+        for key in self.rules_db_info.iterkeys():
+            current_table_rules.setdefault(key[0], set()).add(key)
 
-        new_rules = set(self.rules_info.iterkeys())
-        new_dataplane_rules = set()
-        new_controlplane_rules = set()
-        current_rules = set(self.rules_db_info.iterkeys())
-        current_dataplane_rules = set()
-        current_controlplane_rules = set()
+        diff = {}
+        for table_name in set(new_table_rules) | set(current_table_rules):
+            new_rules = new_table_rules.get(table_name, set())
+            current_rules = current_table_rules.get(table_name, set())
 
-        for key in new_rules:
-            table_name = key[0]
-            if self.tables_db_info[table_name]['type'].upper() == self.ACL_TABLE_TYPE_CTRLPLANE:
-                new_controlplane_rules.add(key)
-            else:
-                new_dataplane_rules.add(key)
+            added_rules = list(new_rules.difference(current_rules))
+            removed_rules = list(current_rules.difference(new_rules))
+            changed_rules = [key for key in new_rules.intersection(current_rules)
+                             if cmp(rule_db_values(self.rules_info[key]), rule_db_values(self.rules_db_info[key])) != 0]
 
-        for key in current_rules:
-            table_name = key[0]
-            if self.tables_db_info[table_name]['type'].upper() == self.ACL_TABLE_TYPE_CTRLPLANE:
-                current_controlplane_rules.add(key)
-            else:
-                current_dataplane_rules.add(key)
+            if added_rules or removed_rules or changed_rules:
+                diff[table_name] = (added_rules, removed_rules, changed_rules)
 
-        # Remove all existing dataplane rules
-        for key in current_dataplane_rules:
-            self.configdb.mod_entry(self.ACL_RULE, key, None)
+        return diff
 
-        # Add all new dataplane rules
-        for key in new_dataplane_rules:
-            self.configdb.mod_entry(self.ACL_RULE, key, self.rules_info[key])
+    def incremental_update(self, make_before_break=False):
+        """
+        Perform incremental ACL rules configuration update. Get existing rules from
+        Config DB. Compare with rules specified in file and only add, remove or
+        modify the rules which differ, so that unchanged rules stay in place.
+        :param make_before_break: Install the added and changed rules of a table
+            from the highest priority down before removing its old rules, from the
+            lowest priority up, so that traffic stays covered during the update.
+            By default old rules are removed first.
+        :return:
+        """
+        def priority(rules, key):
+            return int(rules[key].get("PRIORITY", 0))
 
-        added_controlplane_rules = new_controlplane_rules.difference(current_controlplane_rules)
-        removed_controlplane_rules = current_controlplane_rules.difference(new_controlplane_rules)
-        existing_controlplane_rules = new_rules.intersection(current_controlplane_rules)
+        for table_name, (added_rules, removed_rules, changed_rules) in self.diff_rules().iteritems():
+            if not make_before_break:
+                for key in removed_rules:
+                    self.configdb.mod_entry(self.ACL_RULE, key, None)
 
-        for key in added_controlplane_rules:
-            self.configdb.mod_entry(self.ACL_RULE, key, self.rules_info[key])
+                for key in changed_rules:
+                    self.configdb.set_entry(self.ACL_RULE, key, self.rules_info[key])
 
-        for key in removed_controlplane_rules:
-            self.configdb.mod_entry(self.ACL_RULE, key, None)
+                for key in added_rules:
+                    self.configdb.mod_entry(self.ACL_RULE, key, self.rules_info[key])
+                continue
 
-        for key in existing_controlplane_rules:
-            if cmp(self.rules_info[key], self.rules_db_info[key]) != 0:
-                self.configdb.set_entry(self.ACL_RULE, key, self.rules_info[key])
+            for key in sorted(added_rules + changed_rules, key=lambda key: priority(self.rules_info, key), reverse=True):
+                if key in changed_rules:
+                    self.configdb.set_entry(self.ACL_RULE, key, self.rules_info[key])
+                else:
+                    self.configdb.mod_entry(self.ACL_RULE, key, self.rules_info[key])
 
+            for key in sorted(removed_rules, key=lambda key: priority(self.rules_db_info, key)):
+                self.configdb.mod_entry(self.ACL_RULE, key, None)
 
     def delete(self, table=None, rule=None):
         """
@@ -679,10 +696,13 @@ def full(ctx, filename, table_name, session_name, max_priority):
 @click.argument('filename', type=click.Path(exists=True))
 @click.option('--session_name', type=click.STRING, required=False)
 @click.option('--max_priority', type=click.INT, required=False)
+@click.option('--make_before_break', is_flag=True, default=False,
+              help='Install new and changed rules, highest priority first, before removing old ones')
 @click.pass_context
-def incremental(ctx, filename, session_name, max_priority):
+def incremental(ctx, filename, session_name, max_priority, make_before_break):
     """
     Incremental update of ACL rule configuration.
+    Only the rules which differ from the existing ones are added, removed or modified.
     """
     acl_loader = ctx.obj["acl_loader"]
 
@@ -693,7 +713,7 @@ def incremental(ctx, filename, session_name, max_priority):
         acl_loader.set_max_priority(max_priority)
 
     acl_loader.load_rules_from_file(filename)
-    acl_loader.incremental_update()
+    acl_loader.incremental_update(make_before_break)
 
 
 @cli.command()
@@ -790,9 +790,12 @@ def full(file_name):
 
 @update.command()
 @click.argument('file_name', required=True)
-def incremental(file_name):
+@click.option('--make-before-break', is_flag=True, help="Install new rules before removing old ones")
+def incremental(file_name, make_before_break):
     """Incremental update of ACL rule configuration."""
     command = "acl-loader update incremental {}".format(file_name)
+    if make_before_break:
+        command += " --make_before_break"
     run_command(command)
 
 #
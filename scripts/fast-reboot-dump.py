@@ -9,6 +9,7 @@ import os
 from fcntl import ioctl
 import binascii
 import argparse
+from utilities_common.fdb import FDB_ENTRY_PREFIX, FdbReader
 
 
 ARP_CHUNK = binascii.unhexlify('08060001080006040001') # defines a part of the packet for ARP Request
@@ -54,83 +55,33 @@ def get_vlan_ifaces():
 
     return vlans
 
-def get_bridge_port_id_2_port_id(db):
-    bridge_port_id_2_port_id = {}
-    keys = db.keys(db.ASIC_DB, 'ASIC_STATE:SAI_OBJECT_TYPE_BRIDGE_PORT:oid:*')
-    keys = [] if keys is None else keys
-    for key in keys:
-        value = db.get_all(db.ASIC_DB, key)
-        port_type = value['SAI_BRIDGE_PORT_ATTR_TYPE']
-        if port_type != 'SAI_BRIDGE_PORT_TYPE_PORT':
-            continue
-        port_id = value['SAI_BRIDGE_PORT_ATTR_PORT_ID']
-        # ignore admin status
-        bridge_id = key.replace('ASIC_STATE:SAI_OBJECT_TYPE_BRIDGE_PORT:', '')
-        bridge_port_id_2_port_id[bridge_id] = port_id
-
-    return bridge_port_id_2_port_id
-
-def get_map_port_id_2_iface_name(db):
-    port_id_2_iface = {}
-    keys = db.keys(db.ASIC_DB, 'ASIC_STATE:SAI_OBJECT_TYPE_HOSTIF:oid:*')
-    keys = [] if keys is None else keys
-    for key in keys:
-        value = db.get_all(db.ASIC_DB, key)
-        port_id = value['SAI_HOSTIF_ATTR_OBJ_ID']
-        iface_name = value['SAI_HOSTIF_ATTR_NAME']
-        port_id_2_iface[port_id] = iface_name
-
-    return port_id_2_iface
-
-def get_map_bridge_port_id_2_iface_name(db):
-    bridge_port_id_2_port_id = get_bridge_port_id_2_port_id(db)
-    port_id_2_iface = get_map_port_id_2_iface_name(db)
-
-    bridge_port_id_2_iface_name = {}
-
-    for bridge_port_id, port_id in bridge_port_id_2_port_id.items():
-        if port_id in port_id_2_iface:
-            bridge_port_id_2_iface_name[bridge_port_id] = port_id_2_iface[port_id]
-        else:
-            print "Not found"
-
-    return bridge_port_id_2_iface_name
-
-def get_vlan_oid_by_vlan_id(db, vlan_id):
-    keys = db.keys(db.ASIC_DB, 'ASIC_STATE:SAI_OBJECT_TYPE_VLAN:oid:*')
-    keys = [] if keys is None else keys
-    for key in keys:
-        value = db.get_all(db.ASIC_DB, key)
-        if 'SAI_VLAN_ATTR_VLAN_ID' in value and int(value['SAI_VLAN_ATTR_VLAN_ID']) == vlan_id:
-            return key.replace('ASIC_STATE:SAI_OBJECT_TYPE_VLAN:', '')
+def get_vlan_oid_by_vlan_id(reader, vlan_id):
+    for bvid, bvid_vlan_id in reader.bvid_vlan_map.items():
+        if bvid_vlan_id == vlan_id:
+            return bvid
 
     raise Exception('Not found bvi oid for vlan_id: %d' % vlan_id)
 
-def get_fdb(db, vlan_name, vlan_id, bridge_id_2_iface):
+def get_fdb(reader, vlan_name, vlan_id):
     fdb_types = {
       'SAI_FDB_ENTRY_TYPE_DYNAMIC': 'dynamic',
       'SAI_FDB_ENTRY_TYPE_STATIC' : 'static'
     }
 
-    bvid = get_vlan_oid_by_vlan_id(db, vlan_id)
+    bvid = get_vlan_oid_by_vlan_id(reader, vlan_id)
     available_macs = set()
     map_mac_ip = {}
     fdb_entries = []
-    keys = db.keys(db.ASIC_DB, 'ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:{*\"bvid\":\"%s\"*}' % bvid)
-    keys = [] if keys is None else keys
-    for key in keys:
-        key_obj = json.loads(key.replace('ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:', ''))
-        mac = str(key_obj['mac'])
+    for entry in reader.entries(FDB_ENTRY_PREFIX + '{*\"bvid\":\"%s\"*}' % bvid):
+        mac = str(entry.mac)
         if not is_mac_unicast(mac):
             continue
         available_macs.add((vlan_name, mac.lower()))
         fdb_mac = mac.replace(':', '-')
-        # get attributes
-        value = db.get_all(db.ASIC_DB, key)
-        fdb_type = fdb_types[value['SAI_FDB_ENTRY_ATTR_TYPE']]
-        if value['SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID'] not in bridge_id_2_iface:
+        fdb_type = fdb_types[entry.type]
+        if entry.port is None:
             continue
-        fdb_port = bridge_id_2_iface[value['SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID']]
+        fdb_port = entry.port
 
         obj = {
           'FDB_TABLE:Vlan%d:%s' % (vlan_id, fdb_mac) : {
@@ -151,7 +102,7 @@ def generate_fdb_entries(filename):
     db = swsssdk.SonicV2Connector(host='127.0.0.1')
     db.connect(db.ASIC_DB, False)   # Make one attempt only
 
-    bridge_id_2_iface = get_map_bridge_port_id_2_iface_name(db)
+    reader = FdbReader(db)
 
     vlan_ifaces = get_vlan_ifaces()
 
@@ -159,7 +110,7 @@ def generate_fdb_entries(filename):
     map_mac_ip_per_vlan = {}
     for vlan in vlan_ifaces:
         vlan_id = int(vlan.replace('Vlan', ''))
-        fdb_entry, available_macs, map_mac_ip_per_vlan[vlan] = get_fdb(db, vlan, vlan_id, bridge_id_2_iface)
+        fdb_entry, available_macs, map_mac_ip_per_vlan[vlan] = get_fdb(reader, vlan, vlan_id)
         all_available_macs |= available_macs
         fdb_entries.extend(fdb_entry)
 
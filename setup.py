@@ -34,6 +34,7 @@ setup(
         'sonic_installer',
         'sonic-utilities-tests',
         'undebug',
+        'utilities_common',
     ],
     package_data={
         'show': ['aliases.ini'],
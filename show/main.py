@@ -481,8 +481,13 @@ def status(interface):
 @cli.command()
 @click.option('-v', '--vlan')
 @click.option('-p', '--port')
+@click.option('-a', '--address', help="MAC address")
+@click.option('-c', '--count-only', is_flag=True, help="Only count the MAC entries")
+@click.option('-s', '--stream', is_flag=True, help="Print the MAC entries as they are fetched, unsorted")
+@click.option('--offset', type=int, help="Skip the first N MAC entries")
+@click.option('--limit', type=int, help="Display at most N MAC entries")
 @click.option('--verbose', is_flag=True, help="Enable verbose output")
-def mac(vlan, port, verbose):
+def mac(vlan, port, address, count_only, stream, offset, limit, verbose):
     """Show MAC (FDB) entries"""
 
     cmd = "fdbshow"
@@ -493,6 +498,21 @@ def mac(vlan, port, verbose):
     if port is not None:
         cmd += " -p {}".format(port)
 
+    if address is not None:
+        cmd += " -m {}".format(address)
+
+    if count_only:
+        cmd += " -c"
+
+    if stream:
+        cmd += " -s"
+
+    if offset is not None:
+        cmd += " --offset {}".format(offset)
+
+    if limit is not None:
+        cmd += " --limit {}".format(limit)
+
     run_command(cmd, display_cmd=verbose)
 
 #
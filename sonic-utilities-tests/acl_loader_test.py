@@ -25,3 +25,63 @@ class TestAclLoader(TestCase):
     def test_invalid(self):
         with pytest.raises(AclLoaderException):
             yang_acl = AclLoader.parse_acl_json(os.path.join(test_path, 'acl_input/acl2.json'))
+
+class FakeConfigDb(object):
+    def __init__(self):
+        self.ops = []
+
+    def mod_entry(self, table, key, data):
+        self.ops.append(('mod', key, data))
+
+    def set_entry(self, table, key, data):
+        self.ops.append(('set', key, data))
+
+class TestAclLoaderIncremental(TestCase):
+    def setUp(self):
+        self.acl_loader = AclLoader.__new__(AclLoader)
+        self.acl_loader.configdb = FakeConfigDb()
+        self.acl_loader.rules_db_info = {
+            ("DATAACL", "RULE_1"): {"PRIORITY": "9999", "PACKET_ACTION": "FORWARD"},
+            ("DATAACL", "RULE_2"): {"PRIORITY": "9998", "PACKET_ACTION": "FORWARD"},
+            ("DATAACL", "RULE_3"): {"PRIORITY": "9997", "PACKET_ACTION": "FORWARD"},
+            ("EVERFLOW", "RULE_1"): {"PRIORITY": "9999", "MIRROR_ACTION": "everflow0"},
+        }
+        self.acl_loader.rules_info = {
+            ("DATAACL", "RULE_1"): {"PRIORITY": "9999", "PACKET_ACTION": "FORWARD"},
+            ("DATAACL", "RULE_2"): {"PRIORITY": "9998", "PACKET_ACTION": "DROP"},
+            ("DATAACL", "RULE_4"): {"PRIORITY": "9996", "PACKET_ACTION": "FORWARD"},
+            ("DATAACL", "RULE_5"): {"PRIORITY": "9995", "PACKET_ACTION": "FORWARD"},
+            ("EVERFLOW", "RULE_1"): {"PRIORITY": "9999", "MIRROR_ACTION": "everflow0"},
+        }
+
+    def test_diff_rules(self):
+        diff = self.acl_loader.diff_rules()
+        assert diff.keys() == ["DATAACL"]
+        added, removed, changed = diff["DATAACL"]
+        assert sorted(added) == [("DATAACL", "RULE_4"), ("DATAACL", "RULE_5")]
+        assert removed == [("DATAACL", "RULE_3")]
+        assert changed == [("DATAACL", "RULE_2")]
+
+    def test_diff_rules_typed_values(self):
+        self.acl_loader.rules_db_info = {
+            ("DATAACL", "RULE_1"): {"PRIORITY": "9999", "IP_PROTOCOL": "6", "ETHER_TYPE": "2048", "DSCP": "46"},
+        }
+        self.acl_loader.rules_info = {
+            ("DATAACL", "RULE_1"): {"PRIORITY": "9999", "IP_PROTOCOL": 6, "ETHER_TYPE": 2048, "DSCP": 46},
+        }
+        assert self.acl_loader.diff_rules() == {}
+        self.acl_loader.rules_info[("DATAACL", "RULE_1")]["DSCP"] = 8
+        assert self.acl_loader.diff_rules() == {"DATAACL": ([], [], [("DATAACL", "RULE_1")])}
+
+    def test_incremental_update(self):
+        self.acl_loader.incremental_update()
+        ops = self.acl_loader.configdb.ops
+        assert len(ops) == 4
+        assert ops[0] == ('mod', ("DATAACL", "RULE_3"), None)
+        assert ops[1] == ('set', ("DATAACL", "RULE_2"), {"PRIORITY": "9998", "PACKET_ACTION": "DROP"})
+        assert sorted(op[1] for op in ops[2:]) == [("DATAACL", "RULE_4"), ("DATAACL", "RULE_5")]
+
+    def test_make_before_break(self):
+        self.acl_loader.incremental_update(make_before_break=True)
+        ops = [(op[0], op[1][1]) for op in self.acl_loader.configdb.ops]
+        assert ops == [('set', "RULE_2"), ('mod', "RULE_4"), ('mod', "RULE_5"), ('mod', "RULE_3")]
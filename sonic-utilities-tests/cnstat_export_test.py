@@ -0,0 +1,54 @@
+import datetime
+import json
+import os
+import sys
+import pytest
+from StringIO import StringIO
+from unittest import TestCase
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(test_path)
+sys.path.insert(0, modules_path)
+
+from utilities_common.cnstat_export import *
+
+class TestRecordWriter(TestCase):
+    def setUp(self):
+        self.stream = StringIO()
+        self.time = datetime.datetime(2018, 5, 1, 12, 30, 15, 250000)
+
+    def test_ndjson(self):
+        writer = RecordWriter('ndjson', ['port', 'rx_ok'], self.stream)
+        writer.write(self.time, ['Ethernet0', 10])
+        writer.write(self.time, ['Ethernet4', None])
+        lines = self.stream.getvalue().splitlines()
+        assert len(lines) == 2
+        record = json.loads(lines[1])
+        assert record['time'] == epoch(self.time)
+        assert record['port'] == 'Ethernet4'
+        assert record['rx_ok'] is None
+        assert json.loads(lines[0])['rx_ok'] == 10
+
+    def test_csv(self):
+        writer = RecordWriter('csv', ['port', 'rx_ok'], self.stream)
+        writer.write(self.time, ['Ethernet0', 10])
+        writer.write(self.time, ['Ethernet4', None])
+        lines = self.stream.getvalue().splitlines()
+        assert lines[0] == 'time,port,rx_ok'
+        assert lines[1].endswith(',Ethernet0,10')
+        assert lines[2].endswith(',Ethernet4,')
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            RecordWriter('xml', ['port'], self.stream)
+
+    def test_print_error(self):
+        stdout, stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = StringIO(), StringIO()
+        try:
+            print_error("error 1")
+            print_error("error 2", 'ndjson')
+            assert sys.stdout.getvalue() == "error 1\n"
+            assert sys.stderr.getvalue() == "error 2\n"
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
@@ -0,0 +1,77 @@
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import pytest
+from unittest import TestCase
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(test_path)
+sys.path.insert(0, modules_path)
+
+from utilities_common.cnstat_snapshot import *
+
+class TestCounterSnapshot(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'snapshot')
+        self.time = datetime.datetime(2018, 5, 1, 12, 30, 15, 250000)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_round_trip(self):
+        rows = [("Ethernet4", (1, 2, None)), ("Ethernet0", (3, 2**64 - 2, 0)), ("Ethernet12", (5, 6, 7))]
+        save_snapshot(self.path, ("ok", "err", "drop"), rows, self.time)
+        snapshot = CounterSnapshot.load(self.path)
+        assert snapshot.time == self.time
+        assert snapshot.fields == ("ok", "err", "drop")
+        assert len(snapshot) == 3
+        assert snapshot.get("Ethernet4") == (1, 2, None)
+        assert snapshot.get("Ethernet0") == (3, 2**64 - 2, 0)
+        assert snapshot.get("Ethernet12") == (5, 6, 7)
+        assert dict(snapshot.iteritems()) == dict(rows)
+
+    def test_missing_row(self):
+        save_snapshot(self.path, ("ok",), [("Ethernet0", (1,))], self.time)
+        snapshot = CounterSnapshot.load(self.path)
+        assert "Ethernet0" in snapshot
+        assert "Ethernet4" not in snapshot
+        assert snapshot.get("Ethernet4") is None
+        assert snapshot.get("Ethernet4", ()) == ()
+
+    def test_empty(self):
+        save_snapshot(self.path, ("ok", "err"), [], self.time)
+        snapshot = CounterSnapshot.load(self.path)
+        assert len(snapshot) == 0
+        assert snapshot.keys() == []
+        assert snapshot.get("Ethernet0") is None
+
+    def test_replace(self):
+        save_snapshot(self.path, ("ok",), [("Ethernet0", (1,))], self.time)
+        save_snapshot(self.path, ("ok",), [("Ethernet0", (2,))], self.time)
+        assert CounterSnapshot.load(self.path).get("Ethernet0") == (2,)
+        assert os.listdir(self.tmp_dir) == ['snapshot']
+
+    def test_wrong_row_length(self):
+        with pytest.raises(SnapshotError):
+            save_snapshot(self.path, ("ok", "err"), [("Ethernet0", (1,))], self.time)
+        assert os.listdir(self.tmp_dir) == []
+
+    def test_invalid(self):
+        with open(self.path, 'wb') as fp:
+            fp.write(b'(dp0\nS\'time\'\n')
+        with pytest.raises(SnapshotError):
+            CounterSnapshot.load(self.path)
+
+    def test_truncated(self):
+        save_snapshot(self.path, ("ok", "err"), [("Ethernet0", (1, 2)), ("Ethernet4", (3, 4))], self.time)
+        with open(self.path, 'rb') as fp:
+            data = fp.read()
+        # Cut inside the columns, the row index, the row names and the data
+        for size in range(len(data)):
+            with open(self.path, 'wb') as fp:
+                fp.write(data[:size])
+            with pytest.raises(SnapshotError):
+                CounterSnapshot.load(self.path)
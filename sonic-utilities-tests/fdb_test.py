@@ -0,0 +1,105 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest import TestCase
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(test_path)
+sys.path.insert(0, modules_path)
+
+import utilities_common.fdb as fdb
+from utilities_common.fdb import *
+
+class TestFdbCache(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = fdb.FDB_CACHE_DIR
+        fdb.FDB_CACHE_DIR = os.path.join(self.tmp_dir, 'fdbcache-')
+        self.path = cache_path()
+        self.entries = [FdbEntry(1000, "7C:FE:90:80:9F:05", "Ethernet20", FDB_ENTRY_TYPE_DYNAMIC),
+                        FdbEntry(2000, "7C:FE:90:80:9F:10", None, FDB_ENTRY_TYPE_STATIC)]
+
+    def tearDown(self):
+        fdb.FDB_CACHE_DIR = self.cache_dir
+        shutil.rmtree(self.tmp_dir)
+
+    def test_round_trip(self):
+        save_cache(self.path, self.entries)
+        assert load_cache(self.path, FDB_CACHE_TTL) == self.entries
+        assert os.stat(os.path.dirname(self.path)).st_mode & 0o077 == 0
+
+    def test_expired(self):
+        save_cache(self.path, self.entries)
+        time.sleep(0.01)
+        assert load_cache(self.path, 0.001) is None
+
+    def test_missing(self):
+        assert load_cache(self.path, FDB_CACHE_TTL) is None
+
+    def test_invalid(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w') as fp:
+            fp.write('{"time": ')
+        assert load_cache(self.path, FDB_CACHE_TTL) is None
+
+    def test_invalidate(self):
+        save_cache(self.path, self.entries)
+        other_path = cache_path(os.getuid() + 1)
+        save_cache(other_path, self.entries)
+        invalidate_cache()
+        assert not os.path.exists(self.path)
+        assert not os.path.exists(other_path)
+        assert load_cache(self.path, FDB_CACHE_TTL) is None
+
+    def test_unsafe_dir(self):
+        os.makedirs(os.path.dirname(self.path), 0o755)
+        os.chmod(os.path.dirname(self.path), 0o755)
+        save_cache(self.path, self.entries)
+        assert not os.path.exists(self.path)
+
+    def test_symlink_dir(self):
+        target = os.path.join(self.tmp_dir, 'target')
+        os.makedirs(target, 0o700)
+        os.symlink(target, os.path.dirname(self.path))
+        save_cache(self.path, self.entries)
+        assert os.listdir(target) == []
+
+class TestFdbReader(TestCase):
+    def test_parse_key(self):
+        key = FDB_ENTRY_PREFIX + '{"bvid":"oid:0x260000000005e9","mac":"7C:FE:90:80:9F:05","switch_id":"oid:0x21000000000000"}'
+        assert FdbReader.parse_key(key) == {"bvid": "oid:0x260000000005e9", "mac": "7C:FE:90:80:9F:05",
+                                            "switch_id": "oid:0x21000000000000"}
+
+    def test_vlan_id(self):
+        reader = FdbReader(None)
+        reader._bvid_vlan_map = {"oid:0x260000000005e9": 1000}
+        assert reader.get_vlan_id({"bvid": "oid:0x260000000005e9"}) == 1000
+        assert reader.get_vlan_id({"vlan": "2000"}) == 2000
+
+    def test_lookup(self):
+        reader = FdbReader(None)
+        reader._bvid_vlan_map = {"oid:0x260000000005e9": 1000}
+        keys = [FDB_ENTRY_PREFIX + '{"bvid":"oid:0x260000000005e9","mac":"7C:FE:90:80:9F:05","switch_id":"oid:0x21"}',
+                FDB_ENTRY_PREFIX + '{"bvid":"oid:0x260000000005e9","mac":"7C:FE:90:80:9F:10","switch_id":"oid:0x21"}',
+                FDB_ENTRY_PREFIX + '{"bvid":"oid:0x260000000007d1","mac":"7C:FE:90:80:9F:05","switch_id":"oid:0x21"}',
+                FDB_ENTRY_PREFIX + '{"mac":"7C:FE:90:80:9F:10","switch_id":"oid:0x21","vlan":"2000"}']
+        scans = []
+        resolved = []
+        reader.scan = lambda: scans.append(None) or iter(keys)
+        reader.resolve = lambda fdb_str: resolved.extend(fdb_str) or [None] * len(fdb_str)
+        reader.lookup([(1000, "7c:fe:90:80:9f:05"), (2000, "7c:fe:90:80:9f:10")])
+        assert len(scans) == 1
+        assert resolved == [keys[0], keys[3]]
+
+    def test_scan_duplicates(self):
+        class FakeClient(object):
+            def scan_iter(self, match=None, count=None):
+                return iter(["key1", "key2", "key1", "key3", "key2"])
+
+        class FakeDb(object):
+            def get_redis_client(self, db_name):
+                return FakeClient()
+
+        assert list(FdbReader(FakeDb()).scan()) == ["key1", "key2", "key3"]
@@ -0,0 +1,34 @@
+import os
+import sys
+from unittest import TestCase
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(test_path)
+sys.path.insert(0, modules_path)
+
+from utilities_common.watch import *
+
+class TestFormat(TestCase):
+    def test_brate(self):
+        assert format_brate(None) == STATUS_NA
+        assert format_brate(512.0) == '512.00 B/s'
+        assert format_brate(20*1024.0) == '20.00 KB/s'
+        assert format_brate(20*1024*1024.0) == '20.00 MB/s'
+
+    def test_prate(self):
+        assert format_prate(None) == STATUS_NA
+        assert format_prate(1.5) == '1.50/s'
+
+class TestWatch(TestCase):
+    def test_watch(self):
+        samples = []
+        displayed = []
+
+        def sample():
+            if len(samples) == 3:
+                raise KeyboardInterrupt
+            samples.append(len(samples))
+            return samples[-1]
+
+        watch(1, sample, displayed.append, sleep=False)
+        assert displayed == [0, 1, 2]
@@ -0,0 +1,67 @@
+"""
+    Machine readable output of the counter tools.
+
+    Records are written one per line as soon as they are produced, either
+    as JSON objects (ndjson) or as CSV rows after a header line. Every
+    record starts with the time of the counter sample, in seconds since the
+    epoch. Counters that are not available are written as null in ndjson
+    and as an empty field in CSV.
+"""
+
+import csv
+import json
+import sys
+import time
+
+from collections import OrderedDict
+
+EXPORT_FORMATS = ['ndjson', 'csv']
+
+TIME_FIELD = 'time'
+
+
+def print_error(msg, export_format=None):
+    """
+        Print an error message. When records are exported it goes to stderr,
+        so that it is not mixed with the records.
+    """
+    stream = sys.stderr if export_format else sys.stdout
+    stream.write(msg + '\n')
+
+
+def epoch(timestamp):
+    """
+        Convert a datetime to seconds since the epoch.
+    """
+    return time.mktime(timestamp.timetuple()) + timestamp.microsecond / 1e6
+
+
+class RecordWriter(object):
+    """
+        Write records with the given fields in ndjson or CSV format.
+    """
+
+    def __init__(self, export_format, fields, stream=None):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError("Unknown export format %s" % export_format)
+        self.export_format = export_format
+        self.fields = [TIME_FIELD] + list(fields)
+        self.stream = sys.stdout if stream is None else stream
+        self.csv_writer = None
+
+    def write(self, timestamp, values):
+        """
+            Write one record. values are in the order of the fields.
+        """
+        values = [round(epoch(timestamp), 6)] + list(values)
+        if self.export_format == 'ndjson':
+            self.stream.write(json.dumps(OrderedDict(zip(self.fields, values)), separators=(',', ':')))
+            self.stream.write('\n')
+        else:
+            if self.csv_writer is None:
+                self.csv_writer = csv.writer(self.stream, lineterminator='\n')
+                self.csv_writer.writerow(self.fields)
+            self.csv_writer.writerow(['' if value is None else value for value in values])
+
+    def flush(self):
+        self.stream.flush()
@@ -0,0 +1,195 @@
+"""
+    Compact on-disk format for counter baselines.
+
+    The counter tools save a baseline of their counters when they are
+    cleared and print the difference against it later. A snapshot stores
+    that baseline as a table of unsigned 64-bit integers, one row per
+    port/queue/rule and one column per counter, so that it can be loaded
+    with a single read and a row can be looked up without decoding the
+    rest of the file.
+
+    File layout, all integers little endian:
+
+        header     magic (8s), version (I), column count (I), row count (I),
+                   timestamp in seconds since the epoch (d)
+        columns    for every column: name length (H), name (UTF-8)
+        row index  for every row: name offset (I), name length (I), sorted
+                   by row name so that lookups can bisect it
+        row names  the UTF-8 row names the index points into
+        data       row count x column count counters (Q); COUNTER_NA marks
+                   a counter that was not available
+"""
+
+import datetime
+import os
+import struct
+import tempfile
+import time
+
+SNAPSHOT_MAGIC = b'CNSTSNAP'
+SNAPSHOT_VERSION = 1
+
+COUNTER_NA = 0xFFFFFFFFFFFFFFFF
+
+_HEADER = struct.Struct('<8sIIId')
+_COLUMN_NAME_LEN = struct.Struct('<H')
+_ROW_INDEX = struct.Struct('<II')
+_COUNTER = struct.Struct('<Q')
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def _encode(name):
+    return name if isinstance(name, bytes) else name.encode('utf-8')
+
+
+def _decode(name):
+    return name if isinstance(name, str) else name.decode('utf-8')
+
+
+def save_snapshot(path, fields, rows, timestamp=None):
+    """
+        Save a counter snapshot.
+
+        :param path: File to write; it is replaced atomically
+        :param fields: Column (counter) names
+        :param rows: Iterable of (row name, values); a value is an int or
+            None if the counter is not available
+        :param timestamp: datetime of the snapshot, now if not given
+    """
+    if timestamp is None:
+        timestamp = datetime.datetime.now()
+    epoch = time.mktime(timestamp.timetuple()) + timestamp.microsecond / 1e6
+
+    ncols = len(fields)
+    rows = sorted((_encode(name), values) for name, values in rows)
+
+    chunks = [_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, ncols, len(rows), epoch)]
+    for field in fields:
+        field = _encode(field)
+        chunks.append(_COLUMN_NAME_LEN.pack(len(field)))
+        chunks.append(field)
+
+    offset = 0
+    for name, _ in rows:
+        chunks.append(_ROW_INDEX.pack(offset, len(name)))
+        offset += len(name)
+    chunks.extend(name for name, _ in rows)
+
+    data_format = struct.Struct('<%dQ' % ncols)
+    for name, values in rows:
+        if len(values) != ncols:
+            raise SnapshotError("Row %s has %d values, expected %d" % (_decode(name), len(values), ncols))
+        chunks.append(data_format.pack(*[COUNTER_NA if value is None else value for value in values]))
+
+    dirname = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=dirname, prefix='.' + os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(b''.join(chunks))
+        os.rename(tmp_path, path)
+    except:
+        os.unlink(tmp_path)
+        raise
+
+
+class CounterSnapshot(object):
+    """
+        Read-only view of a saved counter snapshot. Rows are decoded on
+        demand.
+    """
+
+    def __init__(self, buf):
+        if len(buf) < _HEADER.size:
+            raise SnapshotError("Not a counter snapshot")
+        magic, version, ncols, nrows, epoch = _HEADER.unpack_from(buf, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError("Not a counter snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError("Unsupported counter snapshot version %d" % version)
+
+        offset = _HEADER.size
+        fields = []
+        for _ in range(ncols):
+            if offset + _COLUMN_NAME_LEN.size > len(buf):
+                raise SnapshotError("Truncated counter snapshot")
+            (length,) = _COLUMN_NAME_LEN.unpack_from(buf, offset)
+            offset += _COLUMN_NAME_LEN.size
+            if offset + length > len(buf):
+                raise SnapshotError("Truncated counter snapshot")
+            fields.append(_decode(buf[offset:offset + length]))
+            offset += length
+
+        self._buf = buf
+        self._nrows = nrows
+        self._index_offset = offset
+        names_offset = offset + nrows * _ROW_INDEX.size
+        if names_offset > len(buf):
+            raise SnapshotError("Truncated counter snapshot")
+        if nrows:
+            last_offset, last_length = _ROW_INDEX.unpack_from(buf, names_offset - _ROW_INDEX.size)
+            self._data_offset = names_offset + last_offset + last_length
+        else:
+            self._data_offset = names_offset
+        self._names_offset = names_offset
+        self._row_format = struct.Struct('<%dQ' % ncols)
+
+        if len(buf) != self._data_offset + nrows * self._row_format.size:
+            raise SnapshotError("Truncated counter snapshot")
+
+        self.fields = tuple(fields)
+        self.time = datetime.datetime.fromtimestamp(epoch)
+
+    @classmethod
+    def load(cls, path):
+        """
+            Load the snapshot saved in path.
+        """
+        with open(path, 'rb') as fp:
+            return cls(fp.read())
+
+    def _name(self, row):
+        offset, length = _ROW_INDEX.unpack_from(self._buf, self._index_offset + row * _ROW_INDEX.size)
+        offset += self._names_offset
+        return self._buf[offset:offset + length]
+
+    def _values(self, row):
+        values = self._row_format.unpack_from(self._buf, self._data_offset + row * self._row_format.size)
+        return tuple(None if value == COUNTER_NA else value for value in values)
+
+    def _find(self, name):
+        name = _encode(name)
+        lo, hi = 0, self._nrows
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._name(mid) < name:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._nrows and self._name(lo) == name:
+            return lo
+        return None
+
+    def __len__(self):
+        return self._nrows
+
+    def __contains__(self, name):
+        return self._find(name) is not None
+
+    def get(self, name, default=None):
+        """
+            Get the values of row name, or default if there is no such row.
+        """
+        row = self._find(name)
+        if row is None:
+            return default
+        return self._values(row)
+
+    def keys(self):
+        return [_decode(self._name(row)) for row in range(self._nrows)]
+
+    def iteritems(self):
+        for row in range(self._nrows):
+            yield _decode(self._name(row)), self._values(row)
@@ -0,0 +1,59 @@
+"""
+    Helpers for reading many Redis keys with few round trips.
+
+    swsssdk's SonicV2Connector issues one blocking request per get()/get_all()
+    call. The helpers below talk to the underlying redis client of an already
+    connected database and batch the requests in pipelines instead.
+"""
+
+# Number of commands queued in a pipeline before it is flushed. Keeps the
+# reply buffers bounded on boxes with many thousands of objects.
+BULK_BATCH_SIZE = 1000
+
+
+def get_all_bulk(db, db_name, keys, batch_size=BULK_BATCH_SIZE):
+    """
+        Get several hashes from one database in pipelined batches.
+
+        Returns a list of dicts in the same order as keys. Missing hashes
+        are returned as None, like SonicV2Connector.get_all() does.
+    """
+    client = db.get_redis_client(db_name)
+    keys = list(keys)
+    tables = []
+    for start in range(0, len(keys), batch_size):
+        pipe = client.pipeline(transaction=False)
+        for key in keys[start:start + batch_size]:
+            pipe.hgetall(key)
+        tables.extend(table if table else None for table in pipe.execute())
+    return tables
+
+
+def get_fields_bulk(db, db_name, keys, fields, batch_size=BULK_BATCH_SIZE):
+    """
+        Get the same fields of several hashes from one database in
+        pipelined batches.
+
+        Returns a list with one list of values per key, in the order of
+        fields. Missing fields or hashes are returned as None.
+    """
+    client = db.get_redis_client(db_name)
+    keys = list(keys)
+    values = []
+    for start in range(0, len(keys), batch_size):
+        pipe = client.pipeline(transaction=False)
+        for key in keys[start:start + batch_size]:
+            pipe.hmget(key, fields)
+        values.extend(pipe.execute())
+    return values
+
+
+def scan_keys(db, db_name, pattern, count=BULK_BATCH_SIZE):
+    """
+        Iterate over the keys of one database matching pattern.
+
+        Unlike KEYS, SCAN walks the keyspace incrementally in batches of
+        about count keys, so a large table does not block the server.
+    """
+    client = db.get_redis_client(db_name)
+    return client.scan_iter(match=pattern, count=count)
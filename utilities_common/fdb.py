@@ -0,0 +1,276 @@
+"""
+    Snapshot of the FDB entries in ASIC DB.
+
+    fdbshow, nbrshow and fast-reboot-dump all resolve the FDB entries of
+    ASIC DB to a VLAN ID, a MAC and a port name. FdbReader does it with a
+    few pipelined passes: the FDB entry keys, bridge ports, host interfaces
+    and VLANs are scanned and their attributes fetched in bulk.
+
+    load_fdb() can keep the resolved entries in a small per-user cache file
+    for a few seconds, so that tools run back to back do not walk ASIC DB
+    again. fdbclear invalidates the cache of all the users.
+"""
+
+import glob
+import itertools
+import json
+import os
+import stat
+import tempfile
+import time
+
+from collections import namedtuple
+from swsssdk import port_util
+from utilities_common.dbutil import BULK_BATCH_SIZE, get_fields_bulk, scan_keys
+
+FDB_ENTRY_PREFIX = "ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:"
+BRIDGE_PORT_PREFIX = "ASIC_STATE:SAI_OBJECT_TYPE_BRIDGE_PORT:"
+HOSTIF_PREFIX = "ASIC_STATE:SAI_OBJECT_TYPE_HOSTIF:"
+VLAN_PREFIX = "ASIC_STATE:SAI_OBJECT_TYPE_VLAN:"
+
+FDB_ENTRY_TYPE_STATIC = "SAI_FDB_ENTRY_TYPE_STATIC"
+FDB_ENTRY_TYPE_DYNAMIC = "SAI_FDB_ENTRY_TYPE_DYNAMIC"
+
+# Seconds the cached FDB entries are used for
+FDB_CACHE_TTL = 5
+
+FDB_CACHE_DIR = "/tmp/fdbcache-"
+FDB_CACHE_FILE = "fdb.json"
+
+# An FDB entry. vlan is the VLAN ID as an int, mac is as in ASIC DB, port
+# is the name of the port or None if the bridge port could not be resolved
+# and type is the SAI FDB entry type.
+FdbEntry = namedtuple("FdbEntry", "vlan, mac, port, type")
+
+
+class FdbReader(object):
+    """
+        Resolve the FDB entries of ASIC DB. The bridge port and VLAN maps
+        are fetched once, on first use.
+    """
+
+    def __init__(self, db):
+        """
+            :param db: SonicV2Connector connected to ASIC DB
+        """
+        self.db = db
+        self._bridge_port_map = None
+        self._bvid_vlan_map = None
+
+    @property
+    def bridge_port_map(self):
+        """
+            Map of the bridge port oids to port names. Only the bridge ports
+            of type port whose port has a host interface are included.
+        """
+        if self._bridge_port_map is None:
+            hostif_str = list(scan_keys(self.db, 'ASIC_DB', HOSTIF_PREFIX + "*"))
+            port_names = {}
+            for obj_id, name in get_fields_bulk(self.db, 'ASIC_DB', hostif_str,
+                                                ["SAI_HOSTIF_ATTR_OBJ_ID", "SAI_HOSTIF_ATTR_NAME"]):
+                if obj_id is not None and name is not None:
+                    port_names[obj_id] = name
+
+            br_port_str = list(scan_keys(self.db, 'ASIC_DB', BRIDGE_PORT_PREFIX + "*"))
+            self._bridge_port_map = {}
+            for s, (port_type, port_id) in zip(br_port_str, get_fields_bulk(
+                    self.db, 'ASIC_DB', br_port_str, ["SAI_BRIDGE_PORT_ATTR_TYPE", "SAI_BRIDGE_PORT_ATTR_PORT_ID"])):
+                if port_type == "SAI_BRIDGE_PORT_TYPE_PORT" and port_id in port_names:
+                    self._bridge_port_map[s[len(BRIDGE_PORT_PREFIX):]] = port_names[port_id]
+        return self._bridge_port_map
+
+    @property
+    def bvid_vlan_map(self):
+        """
+            Map of the VLAN oids to VLAN IDs
+        """
+        if self._bvid_vlan_map is None:
+            vlan_str = list(scan_keys(self.db, 'ASIC_DB', VLAN_PREFIX + "*"))
+            self._bvid_vlan_map = {}
+            for s, (vlan_id,) in zip(vlan_str, get_fields_bulk(self.db, 'ASIC_DB', vlan_str,
+                                                               ["SAI_VLAN_ATTR_VLAN_ID"])):
+                if vlan_id is not None:
+                    self._bvid_vlan_map[s[len(VLAN_PREFIX):]] = int(vlan_id)
+        return self._bvid_vlan_map
+
+    def get_vlan_id(self, fdb):
+        """
+            Get the VLAN ID of the key fields of an FDB entry. A bvid that
+            is not in bvid_vlan_map is looked up and remembered.
+        """
+        if 'vlan' in fdb:
+            return int(fdb["vlan"])
+        vlan_id = self.bvid_vlan_map.get(fdb["bvid"])
+        if vlan_id is None:
+            vlan_id = int(port_util.get_vlan_id_from_bvid(self.db, fdb["bvid"]))
+            self.bvid_vlan_map[fdb["bvid"]] = vlan_id
+        return vlan_id
+
+    def get_bvid(self, vlan_id):
+        """
+            Get the VLAN oid of a VLAN ID, or None if the VLAN is not in
+            ASIC DB
+        """
+        for bvid, bvid_vlan_id in self.bvid_vlan_map.items():
+            if bvid_vlan_id == vlan_id:
+                return bvid
+        return None
+
+    @staticmethod
+    def parse_key(s):
+        """
+            Get the key fields of an ASIC DB FDB entry key
+        """
+        return json.loads(s[len(FDB_ENTRY_PREFIX):])
+
+    def scan(self, pattern=FDB_ENTRY_PREFIX + "*", count=BULK_BATCH_SIZE):
+        """
+            Iterate over the FDB entry keys matching pattern. SCAN may
+            return a key more than once, e.g. while redis rehashes, so the
+            repeats are skipped.
+        """
+        seen = set()
+        for s in scan_keys(self.db, 'ASIC_DB', pattern, count):
+            if s not in seen:
+                seen.add(s)
+                yield s
+
+    def resolve(self, fdb_str):
+        """
+            Fetch the attributes of the given FDB entry keys in one
+            pipelined pass. Returns an FdbEntry per key, or None if the
+            entry is gone.
+        """
+        fdb_attrs = get_fields_bulk(self.db, 'ASIC_DB', fdb_str,
+                                    ["SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID", "SAI_FDB_ENTRY_ATTR_TYPE"])
+        entries = []
+        for s, (br_port_id, ent_type) in zip(fdb_str, fdb_attrs):
+            fdb = self.parse_key(s)
+            if not fdb or br_port_id is None:
+                entries.append(None)
+                continue
+            entries.append(FdbEntry(self.get_vlan_id(fdb), fdb["mac"],
+                                    self.bridge_port_map.get(br_port_id), ent_type))
+        return entries
+
+    def iter_batches(self, pattern=FDB_ENTRY_PREFIX + "*", batch_size=BULK_BATCH_SIZE):
+        """
+            Fetch the FDB entries matching pattern in batches of about
+            batch_size entries. Yields a list of FdbEntry per batch, in the
+            order the keys are scanned.
+        """
+        fdb_keys = self.scan(pattern, batch_size)
+        fdb_str = list(itertools.islice(fdb_keys, batch_size))
+        while fdb_str:
+            yield [fdb for fdb in self.resolve(fdb_str) if fdb is not None]
+            fdb_str = list(itertools.islice(fdb_keys, batch_size))
+
+    def entries(self, pattern=FDB_ENTRY_PREFIX + "*"):
+        """
+            Fetch all the FDB entries matching pattern
+        """
+        return list(itertools.chain.from_iterable(self.iter_batches(pattern)))
+
+    def lookup(self, vlan_macs):
+        """
+            Fetch the FDB entries of the given (VLAN ID, MAC) pairs only.
+            The FDB keys are scanned once and matched against the wanted
+            pairs, and only the matching keys have their attributes fetched.
+        """
+        wanted = set()
+        for vlan_id, mac in vlan_macs:
+            wanted.add(("vlan", vlan_id, mac.upper()))
+            bvid = self.get_bvid(vlan_id)
+            if bvid is not None:
+                wanted.add(("bvid", bvid, mac.upper()))
+
+        def key_fields(fdb):
+            if 'vlan' in fdb:
+                return ("vlan", int(fdb["vlan"]), fdb["mac"].upper())
+            return ("bvid", fdb["bvid"], fdb["mac"].upper())
+
+        fdb_str = []
+        for s in self.scan():
+            fdb = self.parse_key(s)
+            if fdb and key_fields(fdb) in wanted:
+                fdb_str.append(s)
+
+        return [fdb for fdb in self.resolve(fdb_str) if fdb is not None]
+
+
+def cache_path(uid=None):
+    return os.path.join(FDB_CACHE_DIR + str(os.getuid() if uid is None else uid), FDB_CACHE_FILE)
+
+
+def save_cache(path, entries):
+    """
+        Save FDB entries in a cache file, replaced atomically. The cache
+        directory is only accessible by its owner. Nothing is saved if the
+        directory is a symlink, is owned by another user or is accessible
+        by others, since another user could have created it first.
+    """
+    dirname = os.path.dirname(path)
+    if not os.path.lexists(dirname):
+        os.makedirs(dirname, 0o700)
+    st = os.lstat(dirname)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        return
+    fd, tmp_path = tempfile.mkstemp(dir=dirname, prefix='.' + os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'w') as fp:
+            json.dump({'time': time.time(), 'entries': entries}, fp, separators=(',', ':'))
+        os.rename(tmp_path, path)
+    except:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_cache(path, ttl):
+    """
+        Load the FDB entries of a cache file saved less than ttl seconds
+        ago. Returns None if there is no such cache, or if it is not owned
+        by the current user.
+    """
+    try:
+        if os.lstat(os.path.dirname(path)).st_uid != os.getuid():
+            return None
+        with open(path) as fp:
+            cache = json.load(fp)
+        if not 0 <= time.time() - cache['time'] < ttl:
+            return None
+        return [FdbEntry._make(entry) for entry in cache['entries']]
+    except (IOError, OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def invalidate_cache():
+    """
+        Remove the FDB caches of all the users that can be removed
+    """
+    for path in glob.glob(os.path.join(FDB_CACHE_DIR + "*", FDB_CACHE_FILE)):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def load_fdb(db, cache_ttl=0):
+    """
+        Get all the FDB entries of ASIC DB. If cache_ttl is not 0, entries
+        cached less than cache_ttl seconds ago are used, and fresh ones are
+        cached.
+
+        :param db: SonicV2Connector connected to ASIC DB
+    """
+    if cache_ttl:
+        entries = load_cache(cache_path(), cache_ttl)
+        if entries is not None:
+            return entries
+
+    entries = FdbReader(db).entries()
+    if cache_ttl:
+        try:
+            save_cache(cache_path(), entries)
+        except (IOError, OSError):
+            pass
+    return entries
@@ -0,0 +1,64 @@
+"""
+    Rate formatting and refresh loop shared by the --period and --watch
+    modes of the counter tools.
+"""
+
+import sys
+import time
+
+STATUS_NA = 'N/A'
+
+# Clears the terminal and moves the cursor home before each refresh
+CLEAR_SCREEN = "\033[2J\033[H"
+
+
+def format_brate(rate):
+    """
+        Format a byte rate.
+    """
+    if rate is None:
+        return STATUS_NA
+    if rate > 1024*1024*10:
+        rate = "{:.2f}".format(rate/1024/1024)+' MB'
+    elif rate > 1024*10:
+        rate = "{:.2f}".format(rate/1024)+' KB'
+    else:
+        rate = "{:.2f}".format(rate)+' B'
+    return rate+'/s'
+
+
+def format_prate(rate):
+    """
+        Format a packet rate.
+    """
+    if rate is None:
+        return STATUS_NA
+    return "{:.2f}".format(rate)+'/s'
+
+
+def clear_screen():
+    """
+        Clear the terminal, if the output goes to one.
+    """
+    if sys.stdout.isatty():
+        sys.stdout.write(CLEAR_SCREEN)
+
+
+def watch(interval, sample, display, sleep=True):
+    """
+        Take a sample every interval seconds and display it, until
+        interrupted. The output is flushed after every display, so that it
+        can be piped.
+
+        :param sample: Function taking a sample and returning it
+        :param display: Function printing a sample
+        :param sleep: False if sample() itself waits for the interval
+    """
+    try:
+        while True:
+            if sleep:
+                time.sleep(interval)
+            display(sample())
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass